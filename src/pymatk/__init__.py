@@ -2,4 +2,6 @@ __name__ = "pymatk"
 
 
 def main() -> None:
-    print(f"Hello from {__name__}")
+    from pymatk.cli import main as cli_main
+
+    cli_main()
@@ -0,0 +1,3 @@
+from pymatk import main
+
+main()
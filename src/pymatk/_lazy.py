@@ -0,0 +1,20 @@
+import importlib
+
+from typing import Callable, Dict
+
+
+def lazy_getattr(package: str, attributes: Dict[str, str]) -> Callable[[str], object]:
+    """
+    Builds a module-level `__getattr__` (PEP 562) for `package` that only
+    imports the submodule defining an attribute the first time it is accessed.
+    `attributes` maps each public name to the relative submodule it lives in.
+    """
+
+    def __getattr__(name: str) -> object:
+        if name not in attributes:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+        value = getattr(importlib.import_module(attributes[name], package), name)
+        setattr(importlib.import_module(package), name, value)
+        return value
+
+    return __getattr__
@@ -0,0 +1,109 @@
+import argparse
+import logging
+import os
+import signal
+import threading
+import time
+
+from typing import List
+
+from pymatk.logging import logger
+
+# How often to check that acquisition is still alive while waiting to stop
+_POLL_INTERVAL = 0.5
+
+
+def _positive_float(value: str) -> float:
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, not {value}")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pymatk", description="Python Measurement Automation Toolkit"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run headless acquisition from a config file.")
+    run_parser.add_argument("config", help="Path to a .toml configuration file.")
+    run_parser.add_argument(
+        "--duration",
+        type=_positive_float,
+        default=None,
+        help="Seconds to acquire for. Runs until interrupted (Ctrl+C) if not given.",
+    )
+    run_parser.add_argument(
+        "--rate",
+        type=_positive_float,
+        default=None,
+        help="Sampling rate in Hz. Defaults to the manager's update time.",
+    )
+    run_parser.add_argument("--debug", action="store_true", help="Enable debug logging.")
+    return parser
+
+
+def run(
+    config: str, duration: float | None = None, rate: float | None = None, debug: bool = False
+) -> int:
+    # Imported here so `pymatk --help` and argument errors stay fast
+    from pymatk.managers import BasicManager
+
+    logger.setLevel(logging.DEBUG if debug else logging.INFO)
+
+    manager_kwargs = {"debug": debug, "running": False}
+    if rate is not None:
+        manager_kwargs["update_time"] = 1 / rate
+
+    stop_event = threading.Event()
+
+    def handle_signal(signum, frame):
+        logger.info("Interrupt received, stopping acquisition.")
+        stop_event.set()
+
+    previous_handler = signal.signal(signal.SIGINT, handle_signal)
+    try:
+        description = os.path.splitext(os.path.basename(config))[0]
+        manager = BasicManager(description, config, **manager_kwargs)
+        if stop_event.is_set():
+            # Interrupted while instruments were being set up
+            logger.info("Interrupted before acquisition started.")
+            return 0
+        manager.start()
+        logger.info(f"Acquisition started from '{config}'.")
+        deadline = None if duration is None else time.monotonic() + duration
+        while manager.is_running():
+            timeout = _POLL_INTERVAL
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.monotonic())
+                if timeout <= 0:
+                    break
+            if stop_event.wait(timeout):
+                break
+        failed = not manager.is_running()
+        manager.stop()
+        if failed:
+            logger.error("Acquisition stopped unexpectedly.")
+            return 1
+        logger.info("Acquisition stopped.")
+        return 0
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        if not os.path.isfile(args.config):
+            parser.error(f"config file not found: {args.config}")
+        from pymatk.config_parser import ConfigValidationError
+
+        try:
+            status = run(args.config, duration=args.duration, rate=args.rate, debug=args.debug)
+        except ConfigValidationError as e:
+            parser.exit(1, f"{e}\n")
+        if status:
+            parser.exit(status)
@@ -1,2 +1,11 @@
-from .config_file_enums import InstrumentConfigEnums, DataConfigEnums
-from .config_parser import ConfigParser
+from .config_file_enums import InstrumentConfigEnums, DataConfigEnums, StreamConfigEnums
+from .config_parser import ConfigParser, verify_plan
+from .config_plan import (
+    ConfigPlan,
+    ConfigValidationError,
+    InstrumentPlan,
+    SettingPlan,
+    StreamPlan,
+    VariablePlan,
+)
+from .config_cache import load_config_plan
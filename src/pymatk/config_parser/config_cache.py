@@ -0,0 +1,64 @@
+import hashlib
+import os
+import pickle
+import tomllib
+
+from pymatk.config_parser.config_parser import ConfigParser, verify_plan
+from pymatk.config_parser.config_plan import PLAN_VERSION, ConfigPlan
+from pymatk.logging import logger
+
+DEFAULT_CACHE_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "pymatk")
+
+
+def load_config_plan(
+    config_file: str, description: str = "", cache_directory: str | None = DEFAULT_CACHE_DIRECTORY
+) -> ConfigPlan:
+    """
+    Returns the compiled `ConfigPlan` for `config_file`. Plans are cached in
+    `cache_directory` keyed by the SHA-256 of the file contents, so unchanged
+    configs skip TOML parsing and structural validation on later launches.
+    Pass `cache_directory=None` to always recompile.
+
+    :raises ConfigValidationError: if the config is invalid, including a
+        cached plan that no longer matches the installed instrument code.
+    """
+    with open(config_file, "rb") as f:
+        contents = f.read()
+    source_hash = hashlib.sha256(contents).hexdigest()
+
+    if cache_directory is not None:
+        cache_file = os.path.join(cache_directory, f"{source_hash}-v{PLAN_VERSION}.pickle")
+        try:
+            with open(cache_file, "rb") as f:
+                plan = pickle.load(f)
+            if not isinstance(plan, ConfigPlan) or plan.source_hash != source_hash:
+                plan = None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            plan = None
+        if plan is not None:
+            # The cache key only covers the config file, but the import, kwargs and
+            # function checks depend on the installed instrument code, which can
+            # change (e.g. a driver upgrade) without the config changing. Re-run
+            # those checks on every hit: the modules are imported to instantiate
+            # the instruments anyway, so this costs little beyond what a launch
+            # already pays, and only the TOML parsing and structural checks are
+            # skipped.
+            verify_plan(plan)
+            logger.debug(f"Loaded cached configuration plan '{cache_file}'.")
+            return plan
+
+    config = tomllib.loads(contents.decode("utf-8"))
+    plan = ConfigParser(description, config).compile(source_hash=source_hash)
+
+    if cache_directory is not None:
+        try:
+            os.makedirs(cache_directory, exist_ok=True)
+            # Write then rename so concurrent launches never read a partial file
+            temp_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(temp_file, "wb") as f:
+                pickle.dump(plan, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, cache_file)
+        except OSError as e:
+            logger.warning(f"Could not cache configuration plan: {e}")
+
+    return plan
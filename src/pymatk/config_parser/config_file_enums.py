@@ -16,9 +16,18 @@ class InstrumentConfigEnums(StrEnum):
     UNITS = "units"
     GET_FUNC = "get_func"
     RETURN_ELEMENT = "return_element"
+    DYNAMIC = "dynamic"
 
 
 class DataConfigEnums(StrEnum):
     DATA = "data"
     PARENT_DIRECTORY = "parent_directory"
     FILESTEM = "filestem"
+
+
+class StreamConfigEnums(StrEnum):
+    STREAM = "stream"
+    HOST = "host"
+    PORT = "port"
+    PATH = "path"
+    BUFFER_SIZE = "buffer_size"
@@ -1,69 +1,356 @@
-from typing import Dict, Tuple
+import importlib
+import inspect
 
-from pymatk.instruments import Instrument, InstrumentSetting, InstrumentVariable
-from pymatk.config_parser import InstrumentConfigEnums, DataConfigEnums
+from typing import Dict, List, Tuple
+
+from pymatk.instruments import Instrument
+from pymatk.config_parser import InstrumentConfigEnums, DataConfigEnums, StreamConfigEnums
+from pymatk.config_parser.config_plan import (
+    DEFAULT_BUFFER_SIZE,
+    DEFAULT_HOST,
+    ConfigPlan,
+    ConfigValidationError,
+    InstrumentPlan,
+    SettingPlan,
+    StreamPlan,
+    VariablePlan,
+    freeze_value,
+    thaw_value,
+)
 
 # TODO: Add docstrings
 
+_DATA_KEYS = {DataConfigEnums.PARENT_DIRECTORY, DataConfigEnums.FILESTEM}
+_STREAM_KEYS = {
+    StreamConfigEnums.HOST,
+    StreamConfigEnums.PORT,
+    StreamConfigEnums.PATH,
+    StreamConfigEnums.BUFFER_SIZE,
+}
+_INSTRUMENT_KEYS = {
+    InstrumentConfigEnums.MODULE,
+    InstrumentConfigEnums.CLASS,
+    InstrumentConfigEnums.KWARGS,
+}
+_INSTRUMENT_TABLE_KEYS = {InstrumentConfigEnums.INIT_SETTINGS, InstrumentConfigEnums.VARIABLES}
+_SETTING_KEYS = {
+    InstrumentConfigEnums.SET_FUNC,
+    InstrumentConfigEnums.SET_VALUE,
+    InstrumentConfigEnums.KWARGS,
+    InstrumentConfigEnums.DYNAMIC,
+}
+_VARIABLE_KEYS = {
+    InstrumentConfigEnums.NAME,
+    InstrumentConfigEnums.UNITS,
+    InstrumentConfigEnums.GET_FUNC,
+    InstrumentConfigEnums.RETURN_ELEMENT,
+    InstrumentConfigEnums.DYNAMIC,
+}
+
 
 class ConfigParser:
     def __init__(self, description: str, config: dict):
         self.description = description
         self._config = config
 
+    def compile(self, source_hash: str | None = None) -> ConfigPlan:
+        """
+        Validates the whole configuration, including that instrument modules,
+        classes, constructor kwargs and get/init functions exist, and compiles
+        it into an immutable `ConfigPlan`.
+
+        :raises ConfigValidationError: listing every error found.
+        """
+        errors: List[str] = []
+        known_tables = {
+            DataConfigEnums.DATA,
+            StreamConfigEnums.STREAM,
+            InstrumentConfigEnums.INSTRUMENTS,
+        }
+
+        data = self._table(self._config, DataConfigEnums.DATA, "", errors, required=True)
+        _check_keys(data, _DATA_KEYS, DataConfigEnums.DATA, errors)
+        parent_directory = _value(
+            data, DataConfigEnums.PARENT_DIRECTORY, str, DataConfigEnums.DATA, errors, True
+        )
+        filestem = _value(data, DataConfigEnums.FILESTEM, str, DataConfigEnums.DATA, errors, True)
+
+        stream = self._compile_stream(errors)
+
+        instruments = []
+        instrument_tables = self._table(
+            self._config, InstrumentConfigEnums.INSTRUMENTS, "", errors, required=True
+        )
+        for instrument_name in instrument_tables:
+            known_tables.add(instrument_name)
+            instrument = self._compile_instrument(instrument_name, instrument_tables, errors)
+            if instrument is not None:
+                instruments.append(instrument)
+
+        for key in self._config:
+            if key not in known_tables:
+                errors.append(
+                    f"Unknown table '{key}': not an instrument in"
+                    + f" '{InstrumentConfigEnums.INSTRUMENTS}'."
+                )
+        _check_duplicate_variables(instruments, errors)
+
+        if errors:
+            raise ConfigValidationError(errors)
+        return ConfigPlan(parent_directory, filestem, tuple(instruments), stream, source_hash)
+
     def parse_data_config(self) -> Tuple[str, str]:
-        parent_directory = self._config[DataConfigEnums.DATA].get(DataConfigEnums.PARENT_DIRECTORY)
-        if parent_directory is None:
-            raise AttributeError(f"No '{DataConfigEnums.PARENT_DIRECTORY}' specified.")
-        filestem = self._config[DataConfigEnums.DATA].get(DataConfigEnums.FILESTEM)
-        if filestem is None:
-            raise AttributeError(f"No '{DataConfigEnums.FILESTEM}' specified.")
-        return parent_directory, filestem
+        plan = self.compile()
+        return plan.parent_directory, plan.filestem
 
     def parse_instrument_configurations(self) -> Dict[str, Instrument]:
-        self._instrument_configurations = {}
-        for instrument_name, instrument_config in self._config[
-            InstrumentConfigEnums.INSTRUMENTS
-        ].items():
-            module_name = instrument_config.get(InstrumentConfigEnums.MODULE)
-            class_name = instrument_config.get(InstrumentConfigEnums.CLASS)
-            instrument_kwargs = instrument_config.get(InstrumentConfigEnums.KWARGS)
-
-            new_instrument = Instrument(
-                instrument_name, module_name, class_name, instrument_kwargs
+        return self.compile().build_instruments()
+
+    @staticmethod
+    def _table(config: dict, key: str, location: str, errors: List[str], required=False) -> dict:
+        location = f"{location}.{key}" if location else key
+        table = config.get(key)
+        if table is None:
+            if required:
+                errors.append(f"Missing table '{location}'.")
+            return {}
+        if not isinstance(table, dict):
+            errors.append(f"'{location}' must be a table.")
+            return {}
+        return table
+
+    def _compile_stream(self, errors: List[str]) -> StreamPlan | None:
+        if StreamConfigEnums.STREAM not in self._config:
+            return None
+        location = StreamConfigEnums.STREAM
+        stream = self._table(self._config, StreamConfigEnums.STREAM, "", errors)
+        _check_keys(stream, _STREAM_KEYS, location, errors)
+        buffer_size = _value(stream, StreamConfigEnums.BUFFER_SIZE, int, location, errors)
+        if buffer_size is None:
+            buffer_size = DEFAULT_BUFFER_SIZE
+        elif buffer_size < 1:
+            errors.append(f"'{location}.{StreamConfigEnums.BUFFER_SIZE}' must be at least 1.")
+        path = _value(stream, StreamConfigEnums.PATH, str, location, errors)
+        port = _value(stream, StreamConfigEnums.PORT, int, location, errors)
+        host = _value(stream, StreamConfigEnums.HOST, str, location, errors)
+        if port is not None and not 0 <= port <= 65535:
+            errors.append(f"'{location}.{StreamConfigEnums.PORT}' must be between 0 and 65535.")
+
+        path_given = StreamConfigEnums.PATH in stream
+        port_given = StreamConfigEnums.PORT in stream
+        if path_given and (port_given or StreamConfigEnums.HOST in stream):
+            errors.append(
+                f"'{location}' sets both a Unix-domain '{StreamConfigEnums.PATH}' and a TCP"
+                + f" '{StreamConfigEnums.PORT}'/'{StreamConfigEnums.HOST}'. Use only one."
+            )
+            return None
+        if not path_given and not port_given:
+            errors.append(
+                f"'{location}' needs a '{StreamConfigEnums.PATH}' or '{StreamConfigEnums.PORT}'."
             )
-            self._instrument_configurations[instrument_name] = new_instrument
+            return None
+        if path is not None:
+            return StreamPlan(path, buffer_size)
+        if port is not None:
+            return StreamPlan((host or DEFAULT_HOST, port), buffer_size)
+        return None
+
+    def _compile_instrument(
+        self, name: str, instrument_tables: dict, errors: List[str]
+    ) -> InstrumentPlan | None:
+        location = f"{InstrumentConfigEnums.INSTRUMENTS}.{name}"
+        instrument = self._table(
+            instrument_tables, name, InstrumentConfigEnums.INSTRUMENTS, errors
+        )
+        _check_keys(instrument, _INSTRUMENT_KEYS, location, errors)
+        module_name = _value(instrument, InstrumentConfigEnums.MODULE, str, location, errors, True)
+        class_name = _value(instrument, InstrumentConfigEnums.CLASS, str, location, errors)
+        kwargs = _value(instrument, InstrumentConfigEnums.KWARGS, dict, location, errors)
+
+        table = self._table(self._config, name, "", errors)
+        _check_keys(table, _INSTRUMENT_TABLE_KEYS, name, errors)
+        settings = []
+        for index, setting in enumerate(
+            _array(table, InstrumentConfigEnums.INIT_SETTINGS, name, errors)
+        ):
+            setting_location = f"{name}.{InstrumentConfigEnums.INIT_SETTINGS}[{index}]"
+            settings.append(_compile_setting(setting, setting_location, errors))
+        variables = []
+        for index, variable in enumerate(
+            _array(table, InstrumentConfigEnums.VARIABLES, name, errors)
+        ):
+            variable_location = f"{name}.{InstrumentConfigEnums.VARIABLES}[{index}]"
+            variables.append(_compile_variable(variable, variable_location, errors))
 
-            initial_settings = self._config[instrument_name].get(
-                InstrumentConfigEnums.INIT_SETTINGS
+        if module_name is None:
+            return None
+        plan = InstrumentPlan(
+            name,
+            module_name,
+            class_name,
+            freeze_value(kwargs),
+            tuple(s for s in settings if s is not None),
+            tuple(v for v in variables if v is not None),
+        )
+        _verify_instrument(plan, errors)
+        return plan
+
+
+def _check_keys(table: dict, allowed: set, location: str, errors: List[str]):
+    for key in table:
+        if key not in allowed:
+            errors.append(
+                f"Unknown key '{location}.{key}' (expected one of {', '.join(sorted(allowed))})."
             )
 
-            if initial_settings is not None:
-                for setting in initial_settings:
-                    set_func = setting.get(InstrumentConfigEnums.SET_FUNC)
-                    set_kwargs = setting.get(InstrumentConfigEnums.KWARGS)
-                    set_value = setting.get(InstrumentConfigEnums.SET_VALUE)
-                    new_setting = InstrumentSetting(
-                        new_instrument, set_func, set_value, set_kwargs
-                    )
-                    new_instrument.initial_settings.append(new_setting)
-
-            variables = self._config[instrument_name].get(InstrumentConfigEnums.VARIABLES)
-
-            if variables is not None:
-                for variable in variables:
-                    variable_name = variable.get(InstrumentConfigEnums.NAME)
-                    if variable_name is None:
-                        raise KeyError(
-                            f"No valid variable {InstrumentConfigEnums.NAME}!"
-                            + " Check configuration."
-                        )
-                    units = variable.get(InstrumentConfigEnums.UNITS)
-                    get_func = variable.get(InstrumentConfigEnums.GET_FUNC)
-                    return_element = variable.get(InstrumentConfigEnums.RETURN_ELEMENT)
-                    new_variable = InstrumentVariable(
-                        variable_name, units, new_instrument, get_func, return_element
-                    )
-                    new_instrument.variables.append(new_variable)
-
-        return self._instrument_configurations
+
+def _value(table: dict, key: str, kind: type, location: str, errors: List[str], required=False):
+    value = table.get(key)
+    if value is None:
+        if required:
+            errors.append(f"Missing '{location}.{key}'.")
+        return None
+    # TOML booleans are ints in Python, but never valid where an int is expected
+    if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+        errors.append(f"'{location}.{key}' must be of type {kind.__name__}, not {value!r}.")
+        return None
+    return value
+
+
+def _array(table: dict, key: str, location: str, errors: List[str]) -> List[dict]:
+    array = table.get(key, [])
+    if not isinstance(array, list):
+        errors.append(f"'{location}.{key}' must be an array of tables.")
+        return []
+    return array
+
+
+def _resolve_target(
+    module_name: str, class_name: str | None, kwargs: dict | None, location: str, errors: List[str]
+):
+    try:
+        target = importlib.import_module(module_name)
+    except Exception as e:
+        errors.append(f"'{location}': cannot import module '{module_name}' ({e}).")
+        return None
+    if class_name is None:
+        return target
+    if not hasattr(target, class_name):
+        errors.append(f"'{location}': cannot find class '{class_name}' in '{module_name}'.")
+        return None
+    target = getattr(target, class_name)
+    try:
+        inspect.signature(target).bind(**(kwargs or {}))
+    except TypeError as e:
+        errors.append(
+            f"'{location}.{InstrumentConfigEnums.KWARGS}' do not match {class_name}: {e}."
+        )
+    except ValueError:
+        # No signature available (e.g. some builtins/extensions), so cannot check
+        pass
+    return target
+
+
+def _check_function(target, func: str, description: str, errors: List[str]):
+    if hasattr(target, func):
+        return
+    name = getattr(target, "__name__", target)
+    error = f"{description}: cannot find function/property '{func}' in '{name}'."
+    if isinstance(target, type):
+        error += (
+            f" If it is an instance attribute, set '{InstrumentConfigEnums.DYNAMIC} = true'"
+            + " to check it when the instrument is instantiated instead."
+        )
+    errors.append(error)
+
+
+def _verify_instrument(instrument: InstrumentPlan, errors: List[str]):
+    location = f"{InstrumentConfigEnums.INSTRUMENTS}.{instrument.name}"
+    target = _resolve_target(
+        instrument.module, instrument.class_name, thaw_value(instrument.kwargs), location, errors
+    )
+    if target is None:
+        return
+    for setting in instrument.initial_settings:
+        if not setting.dynamic:
+            _check_function(
+                target,
+                setting.set_func,
+                f"'{instrument.name}' {InstrumentConfigEnums.SET_FUNC}",
+                errors,
+            )
+    for variable in instrument.variables:
+        if not variable.dynamic:
+            _check_function(
+                target,
+                variable.get_func,
+                f"'{instrument.name}' variable '{variable.name}'",
+                errors,
+            )
+
+
+def verify_plan(plan: ConfigPlan):
+    """
+    Re-runs the checks of a `ConfigPlan` that depend on the installed code:
+    that instrument modules and classes import, that constructor kwargs match
+    and that get/init functions exist.
+
+    :raises ConfigValidationError: listing every error found.
+    """
+    errors: List[str] = []
+    for instrument in plan.instruments:
+        _verify_instrument(instrument, errors)
+    if errors:
+        raise ConfigValidationError(errors)
+
+
+def _compile_setting(setting, location: str, errors: List[str]) -> SettingPlan | None:
+    if not isinstance(setting, dict):
+        errors.append(f"'{location}' must be a table.")
+        return None
+    _check_keys(setting, _SETTING_KEYS, location, errors)
+    set_func = _value(setting, InstrumentConfigEnums.SET_FUNC, str, location, errors, True)
+    set_kwargs = _value(setting, InstrumentConfigEnums.KWARGS, dict, location, errors)
+    dynamic = _value(setting, InstrumentConfigEnums.DYNAMIC, bool, location, errors)
+    if set_func is None:
+        return None
+    return SettingPlan(
+        set_func,
+        freeze_value(setting.get(InstrumentConfigEnums.SET_VALUE)),
+        freeze_value(set_kwargs),
+        bool(dynamic),
+    )
+
+
+def _compile_variable(variable, location: str, errors: List[str]) -> VariablePlan | None:
+    if not isinstance(variable, dict):
+        errors.append(f"'{location}' must be a table.")
+        return None
+    _check_keys(variable, _VARIABLE_KEYS, location, errors)
+    name = _value(variable, InstrumentConfigEnums.NAME, str, location, errors, True)
+    units = _value(variable, InstrumentConfigEnums.UNITS, str, location, errors)
+    get_func = _value(variable, InstrumentConfigEnums.GET_FUNC, str, location, errors, True)
+    return_element = variable.get(InstrumentConfigEnums.RETURN_ELEMENT)
+    if return_element is not None and (
+        not isinstance(return_element, (int, str)) or isinstance(return_element, bool)
+    ):
+        errors.append(
+            f"'{location}.{InstrumentConfigEnums.RETURN_ELEMENT}' must be an int or str."
+        )
+    dynamic = _value(variable, InstrumentConfigEnums.DYNAMIC, bool, location, errors)
+    if name is None or get_func is None:
+        return None
+    return VariablePlan(name, units, get_func, return_element, bool(dynamic))
+
+
+def _check_duplicate_variables(instruments: List[InstrumentPlan], errors: List[str]):
+    seen = {}
+    for instrument in instruments:
+        for variable in instrument.variables:
+            if variable.name in seen:
+                errors.append(
+                    f"Variable '{variable.name}' is defined by both '{seen[variable.name]}'"
+                    + f" and '{instrument.name}'."
+                )
+            else:
+                seen[variable.name] = instrument.name
@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from pymatk.instruments import Instrument, InstrumentSetting, InstrumentVariable
+
+# Bump whenever the plan dataclasses change so stale cached plans are ignored
+PLAN_VERSION = 3
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_BUFFER_SIZE = 256
+
+
+class FrozenTable(tuple):
+    """
+    An immutable TOML table, stored as sorted `(key, value)` pairs. A distinct
+    type so that it is not confused with a frozen array of pairs when thawed.
+    """
+
+    __slots__ = ()
+
+
+def freeze_value(value):
+    """Recursively converts TOML tables to `FrozenTable`s and arrays to tuples."""
+    if isinstance(value, dict):
+        return FrozenTable(sorted((key, freeze_value(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(freeze_value(item) for item in value)
+    return value
+
+
+def thaw_value(value):
+    """Inverse of `freeze_value`, returning fresh dicts and lists."""
+    if isinstance(value, FrozenTable):
+        return {key: thaw_value(item) for key, item in value}
+    if isinstance(value, tuple):
+        return [thaw_value(item) for item in value]
+    return value
+
+
+class ConfigValidationError(ValueError):
+    """
+    Raised when a configuration fails validation. `errors` holds every problem
+    found, so a config can be fixed in one pass.
+    """
+
+    def __init__(self, errors: List[str]):
+        self.errors = list(errors)
+        super().__init__(
+            f"{len(self.errors)} configuration error(s):\n"
+            + "\n".join(f"  - {error}" for error in self.errors)
+        )
+
+
+@dataclass(frozen=True)
+class VariablePlan:
+    name: str
+    units: str | None
+    get_func: str
+    return_element: int | str | None = None
+    dynamic: bool = False
+
+
+@dataclass(frozen=True)
+class SettingPlan:
+    set_func: str
+    set_value: object = None
+    set_kwargs: FrozenTable | None = None
+    dynamic: bool = False
+
+
+@dataclass(frozen=True)
+class InstrumentPlan:
+    name: str
+    module: str
+    class_name: str | None = None
+    kwargs: FrozenTable | None = None
+    initial_settings: Tuple[SettingPlan, ...] = ()
+    variables: Tuple[VariablePlan, ...] = ()
+
+    def build(self) -> Instrument:
+        instrument = Instrument(self.name, self.module, self.class_name, thaw_value(self.kwargs))
+        for setting in self.initial_settings:
+            instrument.initial_settings.append(
+                InstrumentSetting(
+                    instrument,
+                    setting.set_func,
+                    thaw_value(setting.set_value),
+                    thaw_value(setting.set_kwargs),
+                )
+            )
+        for variable in self.variables:
+            instrument.variables.append(
+                InstrumentVariable(
+                    variable.name,
+                    variable.units,
+                    instrument,
+                    variable.get_func,
+                    variable.return_element,
+                )
+            )
+        return instrument
+
+
+@dataclass(frozen=True)
+class StreamPlan:
+    address: str | Tuple[str, int]
+    buffer_size: int = DEFAULT_BUFFER_SIZE
+
+
+@dataclass(frozen=True)
+class ConfigPlan:
+    """
+    An immutable, validated form of a configuration file. Plans are hashable
+    and picklable, so they can be cached on disk or handed to worker processes.
+    """
+
+    parent_directory: str
+    filestem: str
+    instruments: Tuple[InstrumentPlan, ...]
+    stream: StreamPlan | None = None
+    source_hash: str | None = None
+
+    def build_instruments(self) -> Dict[str, Instrument]:
+        return {instrument.name: instrument.build() for instrument in self.instruments}
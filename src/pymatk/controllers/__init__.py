@@ -1 +1,8 @@
-from .pid_controller import PIDController
+from typing import TYPE_CHECKING
+
+from pymatk._lazy import lazy_getattr
+
+if TYPE_CHECKING:
+    from .pid_controller import PIDController
+
+__getattr__ = lazy_getattr(__name__, {"PIDController": ".pid_controller"})
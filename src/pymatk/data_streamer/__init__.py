@@ -0,0 +1,15 @@
+from typing import TYPE_CHECKING
+
+from pymatk._lazy import lazy_getattr
+
+if TYPE_CHECKING:
+    from .data_streamer import DataStreamer, DataSubscriber, MessageType
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "DataStreamer": ".data_streamer",
+        "DataSubscriber": ".data_streamer",
+        "MessageType": ".data_streamer",
+    },
+)
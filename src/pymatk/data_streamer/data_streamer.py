@@ -0,0 +1,286 @@
+import json
+import math
+import os
+import socket
+import stat
+import struct
+import threading
+
+from collections import deque
+from enum import IntEnum
+from typing import Iterator, List, Tuple
+
+from pymatk.logging import logger
+
+# Every message is framed as a 1-byte message type and a 4-byte payload length
+_HEADER = struct.Struct("<BI")
+# Sample payloads start with a sequence number so subscribers can detect drops
+_SEQUENCE = struct.Struct("<Q")
+
+Address = str | Tuple[str, int]
+
+
+class MessageType(IntEnum):
+    SCHEMA = 1
+    SAMPLE = 2
+
+
+def _frame(message_type: MessageType, payload: bytes) -> bytes:
+    return _HEADER.pack(message_type, len(payload)) + payload
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _remove_stale_socket(path: str):
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"Cannot stream on '{path}': it exists and is not a socket.")
+    os.unlink(path)
+
+
+def _make_socket(address: Address) -> socket.socket:
+    if isinstance(address, str):
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix-domain sockets are not supported on this platform. Use TCP.")
+        return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+
+class _Subscriber:
+    """
+    A single connected client. Frames are queued in a bounded buffer and sent
+    from a dedicated thread, so a slow client only ever loses its own (oldest)
+    frames and never blocks the publisher.
+    """
+
+    def __init__(self, connection: socket.socket, peer, schema_frame: bytes, buffer_size: int):
+        self.connection = connection
+        self.peer = peer
+        self.dropped = 0
+        self._schema_frame = schema_frame
+        self._frames: deque = deque(maxlen=buffer_size)
+        self._condition = threading.Condition()
+        self._open = True
+        self._thread = threading.Thread(target=self._send_loop, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    @property
+    def is_open(self) -> bool:
+        return self._open
+
+    def push(self, frame: bytes):
+        with self._condition:
+            if len(self._frames) == self._frames.maxlen:
+                self.dropped += 1
+            self._frames.append(frame)
+            self._condition.notify()
+
+    def close(self):
+        with self._condition:
+            self._open = False
+            self._condition.notify()
+        try:
+            self.connection.close()
+        except OSError:
+            pass
+
+    def _send_loop(self):
+        try:
+            self.connection.sendall(self._schema_frame)
+        except OSError:
+            self.close()
+            return
+        while True:
+            with self._condition:
+                while self._open and not self._frames:
+                    self._condition.wait()
+                if not self._open:
+                    return
+                frames = b"".join(self._frames)
+                self._frames.clear()
+            try:
+                self.connection.sendall(frames)
+            except OSError:
+                logger.info(f"Subscriber {self.peer} disconnected.")
+                self.close()
+                return
+
+
+class DataStreamer:
+    """
+    Publishes each sample to any number of local subscribers over a Unix-domain
+    (``address`` is a path) or TCP (``address`` is a ``(host, port)`` tuple)
+    socket.
+
+    On connect, a subscriber receives a single SCHEMA message whose payload is
+    UTF-8 JSON ``{"columns": [...]}``. Each subsequent SAMPLE message carries a
+    little-endian uint64 sequence number followed by one float64 per column;
+    values that cannot be converted to float are sent as NaN. Every message is
+    prefixed with a ``<BI`` header of message type and payload length.
+
+    Each subscriber has its own buffer of ``buffer_size`` frames. When it is
+    full the oldest frame is discarded, so slow consumers drop frames rather
+    than applying backpressure to acquisition.
+    """
+
+    def __init__(self, address: Address, columns: List[str], buffer_size: int = 256):
+        if buffer_size < 1:
+            raise ValueError(f"buffer_size must be at least 1, not {buffer_size}.")
+        self.address = address
+        self.columns = list(columns)
+        self.buffer_size = buffer_size
+        self._values = struct.Struct(f"<{len(self.columns)}d")
+        self._schema_frame = _frame(
+            MessageType.SCHEMA, json.dumps({"columns": self.columns}).encode("utf-8")
+        )
+        self._sequence = 0
+        self._subscribers: List[_Subscriber] = []
+        self._lock = threading.Lock()
+        self._running = False
+        self._socket: socket.socket | None = None
+        self._bound_path: str | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(subscriber.is_open for subscriber in self._subscribers)
+
+    def start(self):
+        if isinstance(self.address, str):
+            _remove_stale_socket(self.address)
+        self._socket = _make_socket(self.address)
+        if not isinstance(self.address, str):
+            self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind(self.address)
+        if isinstance(self.address, str):
+            self._bound_path = self.address
+        self._socket.listen()
+        if not isinstance(self.address, str):
+            self.address = self._socket.getsockname()[:2]
+        self._running = True
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._thread.start()
+        logger.info(f"Streaming data on {self.address}.")
+
+    def stop(self):
+        self._running = False
+        if self._socket is not None:
+            try:
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._socket.close()
+            self._socket = None
+        with self._lock:
+            for subscriber in self._subscribers:
+                subscriber.close()
+            self._subscribers.clear()
+        if self._bound_path is not None:
+            # Only remove the socket this streamer created, never a replacement
+            try:
+                if stat.S_ISSOCK(os.stat(self._bound_path).st_mode):
+                    os.unlink(self._bound_path)
+            except FileNotFoundError:
+                pass
+            self._bound_path = None
+
+    def publish(self, values: List[object]):
+        if len(values) != len(self.columns):
+            raise ValueError(
+                f"Expected {len(self.columns)} values to publish, got {len(values)}."
+            )
+        payload = _SEQUENCE.pack(self._sequence) + self._values.pack(
+            *(_to_float(value) for value in values)
+        )
+        self._sequence += 1
+        frame = _frame(MessageType.SAMPLE, payload)
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s.is_open]
+            for subscriber in self._subscribers:
+                subscriber.push(frame)
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                connection, peer = self._socket.accept()
+            except OSError:
+                break
+            if connection.family != getattr(socket, "AF_UNIX", None):
+                connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            subscriber = _Subscriber(connection, peer, self._schema_frame, self.buffer_size)
+            # Register before sending the schema, so a client that has read the
+            # schema is guaranteed to receive every later sample
+            with self._lock:
+                self._subscribers.append(subscriber)
+            subscriber.start()
+            logger.info(f"Subscriber {peer} connected.")
+
+
+class DataSubscriber:
+    """
+    Client for a `DataStreamer`. Connects, reads the schema and then yields
+    ``(sequence, {column: value})`` for each sample received.
+    """
+
+    def __init__(self, address: Address):
+        self.address = address
+        self._socket = _make_socket(address)
+        self._socket.connect(address)
+        message_type, payload = self._receive()
+        if message_type != MessageType.SCHEMA:
+            raise ConnectionError(f"Expected schema message, got message type {message_type}.")
+        self.columns: List[str] = json.loads(payload.decode("utf-8"))["columns"]
+        self._values = struct.Struct(f"<{len(self.columns)}d")
+
+    def __iter__(self) -> Iterator[Tuple[int, dict]]:
+        return self
+
+    def __next__(self) -> Tuple[int, dict]:
+        try:
+            return self.receive()
+        except ConnectionError:
+            raise StopIteration
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def receive(self) -> Tuple[int, dict]:
+        message_type, payload = self._receive()
+        if message_type != MessageType.SAMPLE:
+            raise ConnectionError(f"Expected sample message, got message type {message_type}.")
+        (sequence,) = _SEQUENCE.unpack_from(payload)
+        values = self._values.unpack_from(payload, _SEQUENCE.size)
+        return sequence, dict(zip(self.columns, values))
+
+    def close(self):
+        self._socket.close()
+
+    def _receive(self) -> Tuple[int, bytes]:
+        message_type, length = _HEADER.unpack(self._receive_exactly(_HEADER.size))
+        return message_type, self._receive_exactly(length)
+
+    def _receive_exactly(self, size: int) -> bytes:
+        buffer = bytearray()
+        while len(buffer) < size:
+            chunk = self._socket.recv(size - len(buffer))
+            if not chunk:
+                raise ConnectionError("Stream closed.")
+            buffer.extend(chunk)
+        return bytes(buffer)
@@ -1 +1,8 @@
-from .data_writer import DataWriter
+from typing import TYPE_CHECKING
+
+from pymatk._lazy import lazy_getattr
+
+if TYPE_CHECKING:
+    from .data_writer import DataWriter
+
+__getattr__ = lazy_getattr(__name__, {"DataWriter": ".data_writer"})
@@ -1,6 +1,5 @@
 import datetime
 import os
-import pandas as pd
 
 from dataclasses import dataclass
 from typing import Tuple
@@ -15,6 +14,9 @@ class DataWriter:
     columns: list
 
     def create_new_file(self):
+        # pandas is slow to import, so only pay for it once a file is created
+        import pandas as pd
+
         self.header = ",".join(self.columns)
         self.filename,  self.out_directory = self.get_new_file_and_path()
         self.full_file_path = f"{self.out_directory}/{self.filename}"
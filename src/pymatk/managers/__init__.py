@@ -1,2 +1,15 @@
-from .basic_manager import BasicManager
-from .experiment_manager import ExperimentManager
+from typing import TYPE_CHECKING
+
+from pymatk._lazy import lazy_getattr
+
+if TYPE_CHECKING:
+    from .basic_manager import BasicManager
+    from .experiment_manager import ExperimentManager
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "BasicManager": ".basic_manager",
+        "ExperimentManager": ".experiment_manager",
+    },
+)
@@ -1,15 +1,15 @@
 import threading
 import time
-import tomllib
 
-from pymatk.config_parser import ConfigParser
+from pymatk.config_parser import ConfigPlan, load_config_plan
+from pymatk.config_parser.config_cache import DEFAULT_CACHE_DIRECTORY
+from pymatk.data_streamer import DataStreamer
 from pymatk.data_writer import DataWriter
 from pymatk.instruments import InstrumentRack
+from pymatk.logging import logger
 
 # TODO: Implement logging and debugging
 
-# TODO: How to start and stop?
-
 # TODO: Add docstrings
 
 
@@ -22,35 +22,45 @@ class BasicManager:
     def __init__(
         self,
         description,
-        config_file: str,
+        config_file: str | ConfigPlan,
         update_time: float = 0.25,
         running: bool = True,
         debug: bool = False,
+        config_cache_directory: str | None = DEFAULT_CACHE_DIRECTORY,
     ):
         self.description = description
         self._running = running
         self._update_time = update_time
         self.debug = debug
 
-        if not config_file.endswith(".toml"):
-            raise FileNotFoundError("Not a valid .toml configuration file.")
-
-        try:
-            with open(config_file, "rb") as f:
-                self._config = tomllib.load(f)
-        except FileNotFoundError:
-            print(f"Config file not found: {config_file}")
-
-        cfg_parser = ConfigParser(self.description, self._config)
+        if isinstance(config_file, ConfigPlan):
+            self._plan = config_file
+        else:
+            if not config_file.endswith(".toml"):
+                raise FileNotFoundError("Not a valid .toml configuration file.")
+            self._plan = load_config_plan(
+                config_file, self.description, cache_directory=config_cache_directory
+            )
 
         self._instrument_rack = InstrumentRack(
-            self.description, cfg_parser.parse_instrument_configurations()
+            self.description, self._plan.build_instruments()
         )
 
         self._data_writer = DataWriter(
-            *cfg_parser.parse_data_config(), self._instrument_rack.get_variable_names(units=True)
+            self._plan.parent_directory,
+            self._plan.filestem,
+            self._instrument_rack.get_variable_names(units=True),
         )
 
+        if self._plan.stream is not None:
+            self._data_streamer = DataStreamer(
+                self._plan.stream.address,
+                self._data_writer.columns,
+                buffer_size=self._plan.stream.buffer_size,
+            )
+        else:
+            self._data_streamer = None
+
         self._instrument_rack.instantiate_instruments()
         self._instrument_rack.initialise_settings()
         self._instrument_rack.configure_variables()
@@ -58,18 +68,54 @@ class BasicManager:
         self._thread = threading.Thread(target=self._main_loop, daemon=True)
 
         if running:
-            self._data_writer.create_new_file()
-            self._thread.start()
+            self.start()
 
     @property
     def instrument_rack(self):
         return self._instrument_rack
 
+    @property
+    def config_plan(self) -> ConfigPlan:
+        return self._plan
+
+    @property
+    def data_streamer(self):
+        return self._data_streamer
+
+    def start(self):
+        self._running = True
+        self._data_writer.create_new_file()
+        if self._data_streamer is not None:
+            self._data_streamer.start()
+        self._thread.start()
+
     def stop(self):
         self._running = False
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+        if self._data_streamer is not None:
+            self._data_streamer.stop()
+
+    def is_running(self) -> bool:
+        return self._thread.is_alive()
 
     def _main_loop(self):
-        while self._running:
-            self._instrument_rack.read_instruments()
-            self._data_writer.write_data(self._instrument_rack.get_variable_values(units=True))
-            time.sleep(self._update_time)
+        try:
+            next_tick = time.monotonic()
+            while self._running:
+                self._instrument_rack.read_instruments()
+                values = self._instrument_rack.get_variable_values(units=True)
+                self._data_writer.write_data(values)
+                if self._data_streamer is not None:
+                    self._data_streamer.publish(list(values.values()))
+                # Sleep until the next tick rather than for a fixed time, so the
+                # time spent reading and writing does not lower the sample rate
+                next_tick += self._update_time
+                delay = next_tick - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Fell behind, so restart the schedule rather than bursting
+                    next_tick = time.monotonic()
+        except Exception:
+            logger.exception("Acquisition stopped due to an error.")
@@ -0,0 +1,296 @@
+import pickle
+import tomllib
+
+import pytest
+
+from pymatk.config_parser import (
+    ConfigParser,
+    ConfigPlan,
+    ConfigValidationError,
+    StreamPlan,
+    load_config_plan,
+)
+from pymatk.config_parser import config_cache
+
+VALID_CONFIG = """
+[data]
+parent_directory = "data"
+filestem = "run"
+
+[instruments.TIME_KEEPER]
+module = "pymatk.software_instruments"
+class = "TimeKeeper"
+
+[[TIME_KEEPER.initial_settings]]
+init_func = "restart"
+
+[[TIME_KEEPER.variables]]
+name = "time"
+units = "s"
+get_func = "elapsed_time"
+
+[instruments.RANDOMGEN]
+module = "pymatk.software_instruments"
+class = "RandomGenerator"
+
+[[RANDOMGEN.initial_settings]]
+init_func = "set_param"
+init_value = 51
+
+[[RANDOMGEN.variables]]
+name = "param_prop"
+get_func = "param"
+"""
+
+
+def compile_config(text: str) -> ConfigPlan:
+    return ConfigParser("test", tomllib.loads(text)).compile()
+
+
+def compile_errors(text: str) -> list:
+    with pytest.raises(ConfigValidationError) as excinfo:
+        compile_config(text)
+    return excinfo.value.errors
+
+
+def test_valid_config_compiles():
+    plan = compile_config(VALID_CONFIG)
+    assert plan.parent_directory == "data"
+    assert plan.filestem == "run"
+    assert [instrument.name for instrument in plan.instruments] == ["TIME_KEEPER", "RANDOMGEN"]
+    assert plan.stream is None
+
+    instruments = plan.build_instruments()
+    assert instruments["RANDOMGEN"].initial_settings[0].set_value == 51
+    assert instruments["TIME_KEEPER"].variables[0].get_func == "elapsed_time"
+
+
+def test_parse_methods_delegate_to_compile():
+    parser = ConfigParser("test", tomllib.loads(VALID_CONFIG))
+    assert parser.parse_data_config() == ("data", "run")
+    assert list(parser.parse_instrument_configurations()) == ["TIME_KEEPER", "RANDOMGEN"]
+
+    parser = ConfigParser("test", tomllib.loads(VALID_CONFIG.replace('filestem = "run"', "")))
+    with pytest.raises(ConfigValidationError):
+        parser.parse_data_config()
+
+
+def test_every_error_reported_in_one_pass():
+    errors = compile_errors(
+        """
+[data]
+parent_directory = "data"
+
+[instruments.TIME_KEEPER]
+module = "pymatk.software_instruments"
+class = "TimeKeeper"
+kwargs = {foo = 1}
+
+[[TIME_KEEPER.variables]]
+name = "time"
+get_func = "elapsed_time"
+
+[instruments.CLOCK]
+module = "time"
+
+[[CLOCK.variables]]
+name = "unix_time"
+get_func = "tme"
+
+[instruments.MISSING_MODULE]
+module = "pymatk.does_not_exist"
+
+[instruments.MISSING_CLASS]
+module = "pymatk.software_instruments"
+class = "NoSuchInstrument"
+
+[[MISSING_CLASS.variables]]
+name = "time"
+get_func = "x"
+
+[[TYPO.variables]]
+name = "x"
+"""
+    )
+    expected = [
+        "'data.filestem'",
+        "'instruments.TIME_KEEPER.kwargs' do not match TimeKeeper",
+        "cannot find function/property 'tme' in 'time'",
+        "cannot import module 'pymatk.does_not_exist'",
+        "cannot find class 'NoSuchInstrument'",
+        "Unknown table 'TYPO'",
+        "Variable 'time' is defined by both 'TIME_KEEPER' and 'MISSING_CLASS'",
+    ]
+    for fragment in expected:
+        assert any(fragment in error for error in errors), fragment
+    assert len(errors) == len(expected)
+
+
+def test_unknown_keys_and_wrong_types_reported():
+    errors = compile_errors(
+        VALID_CONFIG
+        + """
+[[RANDOMGEN.variables]]
+nmae = "typo"
+get_func = 5
+"""
+    )
+    assert any("Unknown key 'RANDOMGEN.variables[1].nmae'" in error for error in errors)
+    assert any("Missing 'RANDOMGEN.variables[1].name'" in error for error in errors)
+    assert any("'RANDOMGEN.variables[1].get_func' must be of type str" in e for e in errors)
+
+
+def test_misspelled_functions_on_class_are_errors():
+    errors = compile_errors(
+        VALID_CONFIG.replace('"elapsed_time"', '"elapsed_tme"').replace('"restart"', '"restrat"')
+    )
+    assert len(errors) == 2
+    assert errors[0].startswith(
+        "'TIME_KEEPER' init_func: cannot find function/property 'restrat' in 'TimeKeeper'."
+    )
+    assert errors[1].startswith(
+        "'TIME_KEEPER' variable 'time': cannot find function/property 'elapsed_tme'"
+        + " in 'TimeKeeper'."
+    )
+
+
+def test_dynamic_opts_out_of_function_check():
+    # TimeKeeper only sets start_time in __init__, so it is not found on the class
+    config = VALID_CONFIG.replace('get_func = "elapsed_time"', 'get_func = "start_time"')
+    errors = compile_errors(config)
+    assert "set 'dynamic = true'" in errors[0]
+
+    plan = compile_config(
+        config.replace('get_func = "start_time"', 'get_func = "start_time"\ndynamic = true')
+    )
+    assert plan.instruments[0].variables[0].dynamic
+
+
+def test_missing_module_level_get_func_is_an_error():
+    errors = compile_errors(
+        """
+[data]
+parent_directory = "data"
+filestem = "run"
+
+[instruments.CLOCK]
+module = "time"
+
+[[CLOCK.variables]]
+name = "time"
+get_func = "no_such_function"
+"""
+    )
+    assert errors == [
+        "'CLOCK' variable 'time': cannot find function/property 'no_such_function' in 'time'."
+    ]
+
+
+@pytest.mark.parametrize(
+    "stream, error",
+    [
+        ('path = "s.sock"\nport = 5000', "sets both a Unix-domain 'path' and a TCP"),
+        ("port = true", "'stream.port' must be of type int"),
+        ('path = "s.sock"\nhost = 1', "'stream.host' must be of type str"),
+        ("port = 70000", "'stream.port' must be between 0 and 65535"),
+        ("buffer_size = 10", "needs a 'path' or 'port'"),
+    ],
+)
+def test_stream_errors(stream, error):
+    errors = compile_errors(VALID_CONFIG + f"\n[stream]\n{stream}\n")
+    assert any(error in e for e in errors), errors
+
+
+def test_stream_plan():
+    plan = compile_config(VALID_CONFIG + "\n[stream]\nport = 5000\n")
+    assert plan.stream == StreamPlan(("127.0.0.1", 5000), 256)
+
+
+def test_plan_is_deeply_immutable_and_hashable():
+    plan = compile_config(
+        VALID_CONFIG
+        + """
+[instruments.COUNTER]
+module = "collections"
+class = "Counter"
+kwargs = {values = [1, 2], nested = {a = [[1, 2]]}}
+"""
+    )
+    counter = plan.instruments[2]
+    values = dict(counter.kwargs)["values"]
+    assert values == (1, 2)
+    with pytest.raises(AttributeError):
+        values.append(3)
+    assert hash(plan) == hash(pickle.loads(pickle.dumps(plan)))
+
+    # Building instruments thaws back to fresh, mutable dicts and lists
+    kwargs = plan.build_instruments()["COUNTER"].kwargs
+    assert kwargs == {"nested": {"a": [[1, 2]]}, "values": [1, 2]}
+    kwargs["values"].append(3)
+    assert dict(counter.kwargs)["values"] == (1, 2)
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text(VALID_CONFIG)
+    return path
+
+
+def test_cache_hit_skips_compilation(config_file, tmp_path, monkeypatch):
+    cache_directory = tmp_path / "cache"
+    plan = load_config_plan(str(config_file), cache_directory=str(cache_directory))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Config was recompiled despite a cached plan.")
+
+    monkeypatch.setattr(ConfigParser, "compile", fail)
+    assert load_config_plan(str(config_file), cache_directory=str(cache_directory)) == plan
+
+
+def test_cache_hit_rechecks_installed_code(config_file, tmp_path, monkeypatch):
+    from pymatk.software_instruments import RandomGenerator
+
+    cache_directory = str(tmp_path / "cache")
+    load_config_plan(str(config_file), cache_directory=cache_directory)
+
+    # Simulate a driver upgrade that renames a method the config relies on
+    monkeypatch.delattr(RandomGenerator, "set_param")
+    with pytest.raises(ConfigValidationError) as excinfo:
+        load_config_plan(str(config_file), cache_directory=cache_directory)
+    assert "'set_param'" in str(excinfo.value)
+
+
+def test_changed_file_misses_cache(config_file, tmp_path):
+    cache_directory = str(tmp_path / "cache")
+    first = load_config_plan(str(config_file), cache_directory=cache_directory)
+    config_file.write_text(VALID_CONFIG.replace('filestem = "run"', 'filestem = "other"'))
+    second = load_config_plan(str(config_file), cache_directory=cache_directory)
+    assert first.source_hash != second.source_hash
+    assert second.filestem == "other"
+
+
+def test_plan_version_change_misses_cache(config_file, tmp_path, monkeypatch):
+    cache_directory = str(tmp_path / "cache")
+    load_config_plan(str(config_file), cache_directory=cache_directory)
+
+    compiled = []
+    original_compile = ConfigParser.compile
+
+    def counting_compile(self, *args, **kwargs):
+        compiled.append(True)
+        return original_compile(self, *args, **kwargs)
+
+    monkeypatch.setattr(ConfigParser, "compile", counting_compile)
+    monkeypatch.setattr(config_cache, "PLAN_VERSION", config_cache.PLAN_VERSION + 1)
+    load_config_plan(str(config_file), cache_directory=cache_directory)
+    assert compiled == [True]
+
+
+def test_invalid_config_is_not_cached(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text(VALID_CONFIG.replace('filestem = "run"', ""))
+    cache_directory = tmp_path / "cache"
+    with pytest.raises(ConfigValidationError):
+        load_config_plan(str(path), cache_directory=str(cache_directory))
+    assert not cache_directory.exists() or not any(cache_directory.iterdir())
@@ -0,0 +1,107 @@
+import math
+import socket
+import time
+
+import pytest
+
+from pymatk.data_streamer import DataStreamer, DataSubscriber
+from pymatk.data_streamer.data_streamer import _HEADER, MessageType
+
+COLUMNS = ["time(s)", "value"]
+
+
+@pytest.fixture(params=["tcp", "unix"])
+def streamer(request, tmp_path):
+    if request.param == "unix":
+        if not hasattr(socket, "AF_UNIX"):
+            pytest.skip("Unix-domain sockets are not supported on this platform.")
+        address = str(tmp_path / "stream.sock")
+    else:
+        address = ("127.0.0.1", 0)
+    streamer = DataStreamer(address, COLUMNS, buffer_size=4)
+    streamer.start()
+    yield streamer
+    streamer.stop()
+
+
+def test_schema_sent_on_connect(streamer):
+    with DataSubscriber(streamer.address) as subscriber:
+        assert subscriber.columns == COLUMNS
+
+
+def test_samples_reach_every_subscriber(streamer):
+    subscribers = [DataSubscriber(streamer.address) for _ in range(3)]
+    for i in range(3):
+        streamer.publish([i, i * 2])
+
+    for subscriber in subscribers:
+        received = [subscriber.receive() for _ in range(3)]
+        assert received == [(i, {"time(s)": i, "value": i * 2}) for i in range(3)]
+        subscriber.close()
+
+
+def test_non_numeric_values_sent_as_nan(streamer):
+    with DataSubscriber(streamer.address) as subscriber:
+        streamer.publish([1.5, "not a number"])
+        sequence, values = subscriber.receive()
+    assert sequence == 0
+    assert values["time(s)"] == 1.5
+    assert math.isnan(values["value"])
+
+
+def test_sample_framing(streamer):
+    with DataSubscriber(streamer.address) as subscriber:
+        streamer.publish([1, 2])
+        message_type, length = _HEADER.unpack(subscriber._receive_exactly(_HEADER.size))
+    assert message_type == MessageType.SAMPLE
+    assert length == 8 + 8 * len(COLUMNS)
+
+
+def test_publish_checks_number_of_values(streamer):
+    with pytest.raises(ValueError):
+        streamer.publish([1])
+
+
+def test_slow_subscriber_drops_frames_without_blocking(streamer):
+    # Connect but never read, so kernel buffers fill and frames must be dropped
+    with DataSubscriber(streamer.address) as slow:
+        start = time.perf_counter()
+        for i in range(50_000):
+            streamer.publish([i, i])
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 5
+        assert streamer._subscribers[0].dropped > 0
+
+        # The newest frame is always kept, and drops show up as sequence gaps
+        slow._socket.settimeout(5)
+        sequences = [slow.receive()[0]]
+        while sequences[-1] != 49_999:
+            sequences.append(slow.receive()[0])
+        assert len(sequences) < 50_000
+        assert any(b - a > 1 for a, b in zip(sequences, sequences[1:]))
+
+
+def test_unix_start_refuses_to_replace_regular_file(tmp_path):
+    path = tmp_path / "victim.csv"
+    path.write_text("data")
+    streamer = DataStreamer(str(path), COLUMNS)
+
+    with pytest.raises(FileExistsError):
+        streamer.start()
+    streamer.stop()
+
+    assert path.read_text() == "data"
+
+
+def test_unix_stop_removes_only_own_socket(tmp_path):
+    path = tmp_path / "stream.sock"
+    streamer = DataStreamer(str(path), COLUMNS)
+    streamer.start()
+    assert path.exists()
+    streamer.stop()
+    assert not path.exists()
+
+    path.write_text("data")
+    DataStreamer(str(path), COLUMNS).stop()
+    assert path.read_text() == "data"
@@ -0,0 +1,64 @@
+import statistics
+import subprocess
+import sys
+
+# Measures the time to import pymatk in a fresh interpreter, and checks that
+# heavy dependencies are not pulled in at import time. pytest runs the
+# heavy-module check; run this file directly (python tests/test_startup.py)
+# to also check the import time budget, exiting non-zero if either regresses.
+
+REPEATS = 10
+BUDGET_SECONDS = 0.25
+HEAVY_MODULES = ["pandas", "numpy", "simple_pid"]
+
+# Covers the import path taken by `pymatk run`, not just the package __init__s
+STATEMENT = """
+import pymatk, pymatk.cli, pymatk.controllers, pymatk.data_writer, pymatk.data_streamer
+from pymatk.managers import BasicManager
+"""
+
+PROBE = f"""
+import sys, time
+start = time.perf_counter()
+{STATEMENT}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+print(elapsed, ",".join(heavy))
+"""
+
+
+def measure_startup():
+    timings, heavy = [], set()
+    for _ in range(REPEATS):
+        elapsed, loaded = _run(PROBE)
+        timings.append(elapsed)
+        heavy.update(loaded)
+    return statistics.median(timings), sorted(heavy)
+
+
+def test_no_heavy_modules_imported_at_startup():
+    _, loaded = _run(PROBE)
+    assert loaded == []
+
+
+def _run(code: str):
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    elapsed, _, loaded = result.stdout.strip().partition(" ")
+    return float(elapsed), [m for m in loaded.split(",") if m]
+
+
+if __name__ == "__main__":
+    import_time, heavy = measure_startup()
+    print(f"Median import time: {import_time * 1e3:.1f} ms (budget {BUDGET_SECONDS * 1e3:.0f} ms)")
+
+    failed = False
+    if heavy:
+        print(f"Heavy modules imported at startup: {', '.join(heavy)}")
+        failed = True
+    if import_time > BUDGET_SECONDS:
+        print("Import time exceeds budget.")
+        failed = True
+
+    sys.exit(1 if failed else 0)